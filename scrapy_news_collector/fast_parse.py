@@ -0,0 +1,44 @@
+"""
+Parser RSS/Atom rapid pe lxml, cu XPath-uri compilate o singură dată.
+Folosit de simple_news_collector.py și de server/feed_worker.py.
+"""
+from itertools import islice
+from lxml import etree
+
+# Atom are namespace implicit, deci și variantele 'a:'. normalize-space() taie și comprimă
+# spațiile direct în libxml2, fără .strip() în Python
+_NS = {'a': 'http://www.w3.org/2005/Atom'}
+_ITEMS = etree.XPath('//item')
+_ENTRIES = etree.XPath('//entry|//a:entry', namespaces=_NS)
+_TITLE = etree.XPath('normalize-space((.//title|.//a:title)[1])', namespaces=_NS)
+_LINK = etree.XPath('normalize-space((.//link/text()|.//link/@href|.//a:link/@href)[1])', namespaces=_NS)
+_PUB = etree.XPath('normalize-space((.//pubDate|.//updated|.//a:updated)[1])', namespaces=_NS)
+_DESC = etree.XPath('normalize-space((.//description|.//summary|.//a:summary)[1])', namespaces=_NS)
+
+# Tolerant la feed-uri ușor invalide; fără entități externe și fără rețea
+_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+
+def iter_articles(root):
+    """Articolele (title, url, pubDate, description) dintr-un arbore lxml de feed"""
+    for item in _ITEMS(root) or _ENTRIES(root):
+        title = _TITLE(item)
+        link = _LINK(item)
+        if title and link:
+            yield {
+                'title': title,
+                'url': link,
+                'pubDate': _PUB(item) or None,
+                'description': _DESC(item)
+            }
+
+
+def parse(body, limit=None):
+    """Parsează un feed RSS/Atom dat ca bytes; cel mult `limit` articole"""
+    try:
+        root = etree.fromstring(body, _PARSER)
+    except etree.XMLSyntaxError:
+        return []
+    if root is None:
+        return []
+    return list(islice(iter_articles(root), limit))
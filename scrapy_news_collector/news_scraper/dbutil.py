@@ -0,0 +1,35 @@
+"""
+Helper-e SQLite comune pentru DatabasePipeline și simple_news_collector.py (fără dependențe Scrapy).
+"""
+import sqlite3
+
+
+def ensure_unique_hash_index(conn):
+    """ON CONFLICT(content_hash) se bazează pe unicitatea content_hash; schema Node o declară
+    deja (content_hash TEXT UNIQUE), așa că indexul se creează doar pentru baze mai vechi.
+    Ridică sqlite3.IntegrityError dacă tabela are deja hash-uri duplicate."""
+    for _, name, unique, *_ in conn.execute("PRAGMA index_list(news_articles)"):
+        if unique and [c[2] for c in conn.execute(f"PRAGMA index_info('{name}')")] == ['content_hash']:
+            return
+    with conn:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_news_hash ON news_articles(content_hash)")
+
+
+def insert_rows(conn, sql, rows):
+    """Inserează lotul cu executemany într-o singură tranzacție. Dacă un rând încalcă o
+    constrângere (CHECK, NOT NULL), reia lotul rând cu rând și sare doar rândurile invalide;
+    întoarce lista (rând, eroare) a celor sărite."""
+    try:
+        with conn:
+            conn.executemany(sql, rows)
+        return []
+    except sqlite3.IntegrityError:
+        pass
+    invalid = []
+    with conn:
+        for row in rows:
+            try:
+                conn.execute(sql, row)
+            except sqlite3.IntegrityError as e:
+                invalid.append((row, e))
+    return invalid
@@ -7,6 +7,7 @@ class NewsItem(scrapy.Item):
     summary = scrapy.Field()
     url = scrapy.Field()
     published_date = scrapy.Field()
+    published_struct = scrapy.Field()  # struct_time[:6] din feed, fără conversie intermediară
     source = scrapy.Field()
     author = scrapy.Field()
     tags = scrapy.Field()
@@ -0,0 +1,14 @@
+import logging
+from scrapy.logformatter import LogFormatter
+
+
+class QuietDropLogFormatter(LogFormatter):
+    """Duplicatele aruncate cu DropItem sunt normale (fiecare feed se recitește la fiecare rulare):
+    le logăm la DEBUG, cu motivul, fără dump-ul întregului item"""
+
+    def dropped(self, item, exception, response, spider):
+        return {
+            'level': logging.DEBUG,
+            'msg': "Dropped: %(exception)s",
+            'args': {'exception': exception},
+        }
@@ -1,5 +1,4 @@
 import random
-import time
 from scrapy.downloadermiddlewares.useragent import UserAgentMiddleware
 
 class NewsScraperDownloaderMiddleware:
@@ -23,12 +22,11 @@ class NewsScraperDownloaderMiddleware:
         request.headers['Accept'] = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
         request.headers['Accept-Language'] = 'en-US,en;q=0.9'
         request.headers['Accept-Encoding'] = 'gzip, deflate, br'
-        request.headers['Cache-Control'] = 'no-cache'
-        request.headers['Pragma'] = 'no-cache'
-        
-        # Delay aleatoriu între request-uri
-        time.sleep(random.uniform(0.5, 2.0))
+        # Fără Cache-Control/Pragma no-cache: HttpCacheMiddleware (RFC2616Policy) trebuie să poată
+        # servi răspunsuri proaspete și să trimită cereri condiționate (304 Not Modified)
         
+        # Delay-ul între request-uri este gestionat de DOWNLOAD_DELAY +
+        # RANDOMIZE_DOWNLOAD_DELAY (non-blocant pentru reactor)
         return None
 
     def process_response(self, request, response, spider):
@@ -1,107 +1,580 @@
 import hashlib
+import re
 import sqlite3
 import os
 import sys
-import json
-import requests
+import asyncio
+import threading
+import aiohttp
+import msgspec
+import orjson
+import tiktoken
+import dateutil.parser
+from collections import OrderedDict, deque
+from functools import lru_cache
 from datetime import datetime
-import requests
+from typing import Optional, Union
+from diskcache import Cache
 from dotenv import load_dotenv
+from itemadapter import ItemAdapter
+from openai import AsyncOpenAI
+from scrapy.exceptions import DropItem
+from scrapy.utils.defer import deferred_from_coro, deferred_to_future
+from twisted.internet import threads
+
+from news_scraper.dbutil import ensure_unique_hash_index, insert_rows
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:  # fallback pur Python mai jos
+    MinHash = MinHashLSH = None
 
 # Încarcă variabilele de mediu
 load_dotenv()
 
+# Pattern-uri precompilate pentru extragerea euristică a instrumentelor
+_RE_STOCK_PAREN = re.compile(r"\(([A-Z]{1,6})\)")
+_RE_TICKER = re.compile(r"\b[A-Z]{1,6}\b")
+_RE_EXCHANGE = re.compile(r"(nasdaq|nyse|amex|tsx|lse|sehk)\s*[:\-]\s*([A-Z]{1,6})", re.I)
+# Forex doar pe coduri ISO 4217 cunoscute: orice cuvânt de 6 majuscule (ex. NVIDIA) nu e o pereche
+_FX_CODES = 'USD|EUR|JPY|GBP|CHF|AUD|CAD|NZD|CNY|CNH|HKD|SGD|SEK|NOK|DKK|PLN|CZK|HUF|RON|TRY|ZAR|MXN|BRL|INR|KRW|RUB'
+_RE_FX = re.compile(rf"\b({_FX_CODES})/?({_FX_CODES})\b")
+_RE_CRYPTO_TICK = re.compile(r"\b(BTC|ETH|SOL|ADA|XRP|DOGE|USDT|USDC|BNB)\b", re.I)
+_RE_CRYPTO_NAME = re.compile(r"\b(bitcoin|ethereum|solana|cardano|ripple|dogecoin)\b", re.I)
+_RE_COMMODITY = re.compile(r"\b(gold|silver|oil|brent|wti|copper|corn|wheat|soy|natural gas)\b", re.I)
+_RE_INDEX = re.compile(r"(s&p|sp500|nasdaq\s*100?|dow\s*jones|dax|ftse|nikkei|cac|hang\s*seng|tsx)", re.I)
+_RE_INDEX_TRADABLE = re.compile(r"(s&p|sp500|nasdaq|dow|dax|ftse|nikkei|cac|hang seng|tsx)", re.I)
+# Cuvinte-cheie direcționale puternice din titlu (scurtătura euristică fără LLM)
+_RE_POSITIVE = re.compile(r"\b(surges?|soar(s|ing)?|rall(y|ies)|jumps?|beats? (estimates|expectations)|record high|upgrade[sd]?|outperforms?)\b", re.I)
+_RE_NEGATIVE = re.compile(r"\b(plunges?|plummets?|slumps?|tumbles?|crash(es)?|sinks?|downgrade[sd]?|miss(es)? (estimates|expectations)|profit warning|record low)\b", re.I)
+# Prefiltre pe textul cu litere mici: regex-ul rulează doar dacă unul dintre cuvinte apare
+_CRYPTO_TICKS = ('btc', 'eth', 'sol', 'ada', 'xrp', 'doge', 'usdt', 'usdc', 'bnb')
+_CRYPTO_NAMES = {
+    'bitcoin': 'BTC', 'ethereum': 'ETH', 'solana': 'SOL',
+    'cardano': 'ADA', 'ripple': 'XRP', 'dogecoin': 'DOGE'
+}
+_COMMODITIES = ('gold', 'silver', 'oil', 'brent', 'wti', 'copper', 'corn', 'wheat', 'soy', 'natural gas')
+_INDEX_WORDS = ('s&p', 'sp500', 'nasdaq', 'dow', 'dax', 'ftse', 'nikkei', 'cac', 'hang', 'tsx')
+_EXCHANGES = ('nasdaq', 'nyse', 'amex', 'tsx', 'lse', 'sehk')
+
+
+def _has_any(text, words):
+    return any(w in text for w in words)
+
+
+# Normalizarea titlurilor pentru deduplicare
+_RE_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+_RE_WS = re.compile(r'\s+')
+# Câmpuri extrase din răspunsuri Ollama care nu sunt JSON valid
+_RE_OLLAMA_REC = re.compile(r'"recommendation":\s*"([^"]+)"', re.I)
+_RE_OLLAMA_CONF = re.compile(r'"confidence_score":\s*(\d+)')
+_RE_OLLAMA_INST = re.compile(r'"instrument_type":\s*"([^"]+)"', re.I)
+# Primul număr dintr-un scor trimis ca text ("80%", "75/100")
+_RE_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+# Cache pe disc pentru apelurile AI / resolve-yahoo (re-rulările nu mai plătesc latența LLM)
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+AI_CACHE_DIR = os.getenv('AI_CACHE_DIR', os.path.join(PROJECT_ROOT, 'data', 'ai_cache'))
+AI_CACHE_TTL = 7 * 86400
+RESOLVE_CACHE_TTL = 30 * 86400
+# Un simbol negăsit poate apărea oricând pe platformă: răspunsurile negative expiră repede
+RESOLVE_NEGATIVE_TTL = 3600
+
+
+# Baza de date a serverului Node (settings + news_articles)
+DB_PATH = os.path.join(PROJECT_ROOT, 'server', 'ainvestorhood.db')
+
+
+def open_cache(name):
+    return Cache(os.path.join(AI_CACHE_DIR, name), size_limit=2**30)
+
+
+# În fereastra de migrare MD5 -> BLAKE2b, verifică existența și după hash-ul MD5 vechi
+CONTENT_HASH_MD5_FALLBACK = os.getenv('CONTENT_HASH_MD5_FALLBACK', '1').lower() in ('1', 'true', 'yes')
+
+
+def content_hash_base(item):
+    """Baza hash-ului de conținut, deja codată UTF-8 (o singură dată pentru toate hash-urile):
+    URL-ul (identificator stabil) sau titlu + conținut"""
+    url = (item.get('url') or '').strip()
+    if url:
+        return url.encode('utf-8')
+    return f"{item.get('title','')}{item.get('content','')}".encode('utf-8')
+
+
+def content_digest(base):
+    """Digest brut de 16 bytes (BLAKE2b-128 din stdlib, aceeași schemă ca simple_news_collector.py);
+    compact pentru seturile de deduplicare"""
+    return hashlib.blake2b(base, digest_size=16).digest()
+
+
+def content_hash(base):
+    """Hash de deduplicare (non-criptografic): cei 32 hex ai digest-ului, ca MD5-ul vechi"""
+    return content_digest(base).hex()
+
+
+def legacy_content_hash(base):
+    return hashlib.md5(base).hexdigest()
+
+
+# Sesiune HTTP partajată de pipeline-uri: keep-alive + pool de conexiuni, retry pe 502/503/504
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.2
+HTTP_RETRY_STATUSES = (502, 503, 504)
+JSON_HEADERS = {'Content-Type': 'application/json'}
+_http_session = None
+_http_users = 0
+
+
+def acquire_http_session():
+    global _http_users
+    _http_users += 1
+
+
+def release_http_session():
+    """Închide sesiunea când ultimul pipeline care o folosește se oprește"""
+    global _http_session, _http_users
+    _http_users -= 1
+    if _http_users <= 0 and _http_session is not None:
+        session, _http_session = _http_session, None
+        return deferred_from_coro(session.close())
+
+
+def _get_http_session():
+    # Creată lazy, pe event loop-ul reactorului asyncio
+    global _http_session
+    if _http_session is None:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=16),
+        )
+    return _http_session
+
+
+async def post_json(url, payload, timeout):
+    """POST JSON prin sesiunea partajată; returnează (status, răspuns JSON sau None)"""
+    session = _get_http_session()
+    body = orjson.dumps(payload)
+    for attempt in range(HTTP_RETRIES + 1):
+        last = attempt == HTTP_RETRIES
+        try:
+            async with session.post(url, data=body, headers=JSON_HEADERS,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+                if last or r.status not in HTTP_RETRY_STATUSES:
+                    if r.status != 200:
+                        return r.status, None
+                    raw = await r.read()
+                    return r.status, (orjson.loads(raw) if raw else None)
+        except aiohttp.ClientConnectionError:
+            if last:
+                raise
+        await asyncio.sleep(HTTP_BACKOFF * (2 ** attempt))
+
+
+def _coerce_score(value):
+    """Scorul de încredere ca int: acceptă și 75.5 sau "80%"; None dacă nu conține un număr"""
+    if isinstance(value, str):
+        m = _RE_NUMBER.search(value)
+        value = float(m.group(0)) if m else None
+    return round(value) if value is not None else None
+
+
+class Analysis(msgspec.Struct):
+    """Schema răspunsului AI; validarea și conversiile de tip sunt generate de msgspec.
+    Tipurile sunt largi intenționat (LLM-urile trimit și "80%" sau nume numerice),
+    iar __post_init__ le aduce la forma salvată."""
+    instrument_type: Optional[str] = 'General'
+    instrument_name: Optional[Union[str, int, float]] = ''
+    recommendation: Optional[str] = 'HOLD'
+    confidence_score: Optional[Union[int, float, str]] = 50
+    analysis: Optional[str] = ''
+
+    def __post_init__(self):
+        # Normalizează la valorile acceptate de constrângerile CHECK din news_articles;
+        # câmpurile scurte și repetitive sunt internate (un singur obiect str per valoare)
+        self.instrument_type = sys.intern(self.instrument_type or 'General')
+        self.instrument_name = sys.intern(str(self.instrument_name) if self.instrument_name is not None else '')
+        recommendation = (self.recommendation or '').upper()
+        self.recommendation = sys.intern(recommendation) if recommendation in ('BUY', 'SELL', 'HOLD') else 'HOLD'
+        score = _coerce_score(self.confidence_score)
+        self.confidence_score = min(100, max(1, score if score is not None else 50))
+        self.analysis = self.analysis or ''
+
+
+def decode_analysis(raw):
+    """JSON (str/bytes) -> Analysis; strict=False acceptă și numere trimise ca string ("75")"""
+    return msgspec.json.decode(raw, type=Analysis, strict=False)
+
+
+# Sare peste LLM când euristica găsește instrumentul în titlu și titlul are o direcție clară (opt-in)
+AI_HEURISTIC_SHORTCUT = os.getenv('AI_HEURISTIC_SHORTCUT', '0').lower() in ('1', 'true', 'yes')
+HEURISTIC_CONFIDENCE = 60
+
+# Bugetul de tokeni pentru conținutul trimis la LLM: clasificarea depinde de primele paragrafe,
+# iar latența/costul cresc aproape liniar cu tokenii de intrare
+AI_MAX_INPUT_TOKENS = int(os.getenv('AI_MAX_INPUT_TOKENS', '400'))
+# Cât așteaptă open_spider encoder-ul (cu cache-ul tiktoken rece, fișierul BPE se descarcă)
+AI_TOKENIZER_LOAD_TIMEOUT = float(os.getenv('AI_TOKENIZER_LOAD_TIMEOUT', '10'))
+_token_encoder = None
+
+
+def _get_token_encoder():
+    """Încarcă encoder-ul cl100k_base (blocant: poate descărca fișierul BPE); rulat în thread pool"""
+    global _token_encoder
+    if _token_encoder is None:
+        try:
+            _token_encoder = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            # Fără fișierul BPE (ex. container offline) folosim aproximarea pe caractere
+            _token_encoder = False
+    return _token_encoder
+
+
+def truncate_tokens(text, max_tokens=AI_MAX_INPUT_TOKENS):
+    """Trunchiază textul la max_tokens tokeni cl100k_base (~4 caractere/token ca fallback)"""
+    if len(text) <= max_tokens:  # fiecare token are cel puțin un caracter
+        return text
+    # Fără încărcare aici (suntem pe event loop): encoder-ul vine din open_spider sau lipsește
+    enc = _token_encoder
+    if not enc:
+        return text[:max_tokens * 4]
+    ids = enc.encode(text)
+    if len(ids) <= max_tokens:
+        return text
+    return enc.decode(ids[:max_tokens])
+
+
+def parse_date(value):
+    """Normalizează o dată la ISO-8601: fromisoformat (C) pe calea rapidă, dateutil doar ca fallback"""
+    # Forma emisă de spider (datetime(...).isoformat(), fără fus orar) e deja normalizată
+    if len(value) == 19 and value[4] == '-' and value[10] == 'T' and value[13] == ':':
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        return dateutil.parser.parse(value).isoformat()
+
+
+_ai_settings = None
+_ai_settings_lock = threading.Lock()
+
+
+def load_ai_settings():
+    """Setările AI din tabela settings, citite o singură dată per proces (un singur SELECT)"""
+    global _ai_settings
+    with _ai_settings_lock:
+        if _ai_settings is None:
+            conn = sqlite3.connect(DB_PATH)
+            try:
+                _ai_settings = dict(conn.execute(
+                    "SELECT key, value FROM settings WHERE key IN ('ai_provider', 'ollama_model')"
+                ))
+            finally:
+                conn.close()
+        return _ai_settings
+
+
+class LRUCache:
+    """Cache mic în memorie cu evacuare LRU, în fața cache-urilor pe disc"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Prompt pentru analiza financiară
+ANALYSIS_PROMPT = """You are a financial analyst AI. Analyze the given financial news article and provide:
+
+1. instrument_type: One of [Stocks, Forex, Crypto, Commodities, Indices, Bonds]
+2. instrument_name: Specific instrument mentioned (e.g., "AAPL", "EUR/USD", "Bitcoin", "Gold", "S&P 500")
+3. recommendation: One of [BUY, SELL, HOLD]
+4. confidence_score: Integer from 1-100 indicating confidence in recommendation
+5. analysis: Brief 1-2 sentence summary of why this recommendation
+
+Response format: JSON only
+{
+  "instrument_type": "...",
+  "instrument_name": "...",
+  "recommendation": "...",
+  "confidence_score": 75,
+  "analysis": "..."
+}"""
+
+
+def extract_heuristic(title: str, content: str):
+    """Heuristic extraction when no AI key: returns (type, name) or (None, None)."""
+    # Doar începutul conținutului intră în cheia cache-ului: memoria rămâne mărginită
+    return _extract_heuristic_cached(title or '', (content or '')[:256])
+
+
+@lru_cache(maxsize=4096)
+def _extract_heuristic_cached(title: str, content: str):
+    text = f"{title} {content}" if content else title
+    lt = text.lower()
+    # Stocks: (AAPL) or EXCHANGE:TICKER
+    if '(' in text:
+        m = _RE_STOCK_PAREN.search(text)
+        if m:
+            return ('Stocks', m.group(1))
+    if _has_any(lt, _EXCHANGES):
+        m = _RE_EXCHANGE.search(text)
+        if m:
+            return ('Stocks', m.group(2).upper())
+    # Forex: EUR/USD or USDJPY (slash-ul e opțional, deci fără prefiltru)
+    m = _RE_FX.search(text)
+    if m:
+        pair = f"{m.group(1).upper()}/{m.group(2).upper()}"
+        return ('Forex', pair)
+    # Crypto: names or tickers
+    if _has_any(lt, _CRYPTO_TICKS):
+        m = _RE_CRYPTO_TICK.search(text)
+        if m:
+            return ('Crypto', m.group(1).upper())
+    if _has_any(lt, _CRYPTO_NAMES):
+        m = _RE_CRYPTO_NAME.search(text)
+        if m:
+            name = m.group(1).lower()
+            return ('Crypto', _CRYPTO_NAMES.get(name, name.upper()))
+    # Commodities: use matched commodity name as instrument_name
+    if _has_any(lt, _COMMODITIES):
+        m = _RE_COMMODITY.search(text)
+        if m:
+            return ('Commodities', m.group(1).title())
+    # Indices
+    if _has_any(lt, _INDEX_WORDS) and _RE_INDEX.search(text):
+        return ('Indices', 'Index')
+    return (None, None)
+
+
+@lru_cache(maxsize=4096)
+def _is_tradable_cached(instrument_type: str, instrument_name: str, title: str) -> bool:
+    t = (instrument_type or '').lower()
+    name = (instrument_name or '').strip()
+    text = f"{name} {title}"
+    if not name:
+        return False
+    lt = text.lower()
+    if t == 'stocks':
+        return bool(('(' in text and _RE_STOCK_PAREN.search(text)) or _RE_TICKER.search(name))
+    if t == 'forex':
+        return bool(_RE_FX.search(text))
+    if t == 'crypto':
+        return _has_any(lt, _CRYPTO_TICKS) and bool(_RE_CRYPTO_TICK.search(text))
+    if t == 'commodities':
+        return _has_any(lt, _COMMODITIES) and bool(_RE_COMMODITY.search(text))
+    if t == 'indices':
+        return _has_any(lt, _INDEX_WORDS) and bool(_RE_INDEX_TRADABLE.search(text))
+    return False
+
+
+class SimpleMinHashLSH:
+    """MinHash + LSH pe benzi, pur Python; folosit doar dacă datasketch lipsește"""
+
+    def __init__(self, num_perm, bands=16):
+        self.seeds = range(num_perm)
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def signature(self, tokens):
+        return tuple(min(hash((seed, t)) for t in tokens) for seed in self.seeds)
+
+    def _bands(self, sig):
+        for i, bucket in enumerate(self.buckets):
+            yield bucket, sig[i * self.rows:(i + 1) * self.rows]
+
+    def query(self, sig):
+        found = set()
+        for bucket, band in self._bands(sig):
+            found.update(bucket.get(band, ()))
+        return found
+
+    def insert(self, key, sig):
+        self.signatures[key] = sig
+        for bucket, band in self._bands(sig):
+            bucket.setdefault(band, []).append(key)
+
+    def remove(self, key):
+        for bucket, band in self._bands(self.signatures.pop(key)):
+            keys = bucket[band]
+            keys.remove(key)
+            if not keys:
+                del bucket[band]
+
+
 class DuplicatesPipeline:
     """Pipeline pentru eliminarea duplicatelor"""
     
+    TITLE_SIMILARITY = 0.8
+    NUM_PERM = 64
+    # Câte titluri recente rămân în indexul de similaritate (memorie constantă pe rulări lungi)
+    RECENT_TITLES = 2000
+    # Câte hash-uri recente din baza de date încărcăm pentru testul de existență
+    DB_HASH_CACHE_SIZE = int(os.getenv('DB_HASH_CACHE_SIZE', '100000'))
+
     def __init__(self):
+        # Digest-uri brute de 16 bytes (jumătate din memoria hex-urilor de 32 caractere)
         self.seen_hashes = set()
+        # content_hash-urile articolelor deja salvate (text, așa cum sunt în news_articles)
+        self.saved_hashes = set()
+        # Index LSH peste MinHash-urile titlurilor normalizate (lookup amortizat O(1))
+        if MinHashLSH is not None:
+            self.lsh = MinHashLSH(threshold=self.TITLE_SIMILARITY, num_perm=self.NUM_PERM)
+        else:
+            self.lsh = SimpleMinHashLSH(self.NUM_PERM)
+        # Token-urile fiecărui titlu indexat: candidații LSH se verifică cu Jaccard exact
+        self.title_tokens = {}
+        # Ordinea de inserare în index; cel mai vechi titlu iese când se depășește RECENT_TITLES
+        self.recent_titles = deque()
+
+    def open_spider(self, spider):
+        # Articolele deja salvate ies aici, înainte de analiza AI (300) și resolve-yahoo (350)
+        try:
+            conn = sqlite3.connect(DB_PATH)
+            try:
+                self.saved_hashes = {h for (h,) in conn.execute(
+                    "SELECT content_hash FROM news_articles ORDER BY id DESC LIMIT ?",
+                    (self.DB_HASH_CACHE_SIZE,)
+                )}
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            spider.logger.warning("Cannot load saved content hashes: %s", e)
 
     def normalize_title(self, text: str) -> str:
         text = (text or '').lower()
-        import re
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _RE_NON_ALNUM.sub(' ', text)
+        text = _RE_WS.sub(' ', text).strip()
         return text
 
+    def title_minhash(self, tokens):
+        if MinHash is None:
+            return self.lsh.signature(tokens)
+        m = MinHash(num_perm=self.NUM_PERM)
+        for token in tokens:
+            m.update(token.encode('utf-8'))
+        return m
+
+    def is_similar(self, tokens, candidates) -> bool:
+        n = len(tokens)
+        for key in candidates:
+            other = self.title_tokens[key]
+            inter = len(tokens & other)
+            # |A ∪ B| = |A| + |B| - |A ∩ B|, fără a construi reuniunea
+            if inter / (n + len(other) - inter) >= self.TITLE_SIMILARITY:
+                return True
+        return False
+
     def process_item(self, item, spider):
         # Generează hash pentru conținut (preferă URL-ul ca identificator stabil)
-        url = (item.get('url') or '').strip()
-        if url:
-            base = url
-        else:
-            base = f"{item.get('title','')}{item.get('content','')}"
-        content_hash = hashlib.md5(base.encode('utf-8')).hexdigest()
-        item['content_hash'] = content_hash
+        base = content_hash_base(item)
+        digest = content_digest(base)
+        item['content_hash'] = digest.hex()
         
-        if content_hash in self.seen_hashes:
-            spider.logger.info(f"Articol duplicat detectat: {item.get('title', 'No title')[:50]}...")
-            return None
+        if digest in self.seen_hashes:
+            raise DropItem(f"Articol duplicat detectat: {item.get('title', 'No title')[:50]}...")
         
-        self.seen_hashes.add(content_hash)
+        self.seen_hashes.add(digest)
 
-        # Soft duplicate check by normalized title similarity
-        fp_now = self.normalize_title(item.get('title', ''))
-        for fp in list(self.seen_hashes)[:2000]:
-            # quick token overlap using set Jaccard
-            try:
-                a = set(fp_now.split())
-                b = set(fp.split())
-                if a and b:
-                    j = len(a & b) / len(a | b)
-                    if j >= 0.8:
-                        spider.logger.info("Articol probabil duplicat (titlu similar)")
-                        return None
-            except Exception:
-                pass
+        # Deja în baza de date (inclusiv rânduri vechi cu hash MD5); cele mai vechi decât
+        # fereastra încărcată sunt prinse la final de ON CONFLICT(content_hash) DO NOTHING
+        if item['content_hash'] in self.saved_hashes or (
+                CONTENT_HASH_MD5_FALLBACK and legacy_content_hash(base) in self.saved_hashes):
+            raise DropItem(f"Articol deja salvat: {item.get('title', 'No title')[:50]}...")
+
+        # Soft duplicate check by normalized title similarity (MinHash LSH, Jaccard ~0.8), și pentru
+        # item-urile cu URL: aceeași știre preluată de alt site are alt URL, deci alt hash exact.
+        # Lookup-ul LSH e amortizat O(1), nu o buclă peste toate titlurile văzute
+        tokens = frozenset(self.normalize_title(item.get('title', '')).split())
+        if tokens:
+            m = self.title_minhash(tokens)
+            if self.is_similar(tokens, self.lsh.query(m)):
+                raise DropItem("Articol probabil duplicat (titlu similar)")
+            self.lsh.insert(digest, m)
+            self.title_tokens[digest] = tokens
+            self.recent_titles.append(digest)
+            if len(self.recent_titles) > self.RECENT_TITLES:
+                oldest = self.recent_titles.popleft()
+                self.lsh.remove(oldest)
+                del self.title_tokens[oldest]
         return item
 
 class AIAnalysisPipeline:
     """Pipeline pentru analiza AI a articolelor"""
     
+    # Cereri de analiză simultane către provider-ul AI
+    CONCURRENCY = int(os.getenv('AI_CONCURRENCY', '4'))
+
     def __init__(self):
         self.client = None
         self.ai_provider = None
         self.ollama_model = None
         self.ollama_url = 'http://localhost:11434'
+        self.request_timeout = float(os.getenv('AI_REQUEST_TIMEOUT', '25'))
+        self._sem = None
+        self._ai_cache = open_cache('analyze')
+        # Rezultatele din rularea curentă, după content_hash (fără drum până la disc)
+        self._memo = LRUCache(4096)
         
         # Citește configurația din baza de date
         self._load_ai_config()
+
+    def open_spider(self, spider):
+        acquire_http_session()
+        self._sem = asyncio.Semaphore(self.CONCURRENCY)
+        # Encoder-ul se încarcă o singură dată, în thread pool, nu la primul item pe thread-ul
+        # reactorului; la eșec sau timeout truncate_tokens rămâne pe aproximarea pe caractere
+        from twisted.internet import reactor
+        d = threads.deferToThread(_get_token_encoder)
+        d.addTimeout(AI_TOKENIZER_LOAD_TIMEOUT, reactor)
+        d.addErrback(lambda failure: spider.logger.warning(
+            "tiktoken encoder not loaded (%s), truncating by characters", failure.type.__name__))
+        return d
+
+    def close_spider(self, spider):
+        self._ai_cache.close()
+        return deferred_from_coro(self._close_clients())
+
+    async def _close_clients(self):
+        if self.client is not None:
+            await self.client.close()
+        released = release_http_session()
+        if released is not None:
+            await deferred_to_future(released)
     
     def _load_ai_config(self):
         """Încarcă configurația AI din baza de date"""
         try:
-            # Calea către baza de date
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.join(current_dir, '..', '..')
-            db_path = os.path.join(project_root, 'server', 'ainvestorhood.db')
-            
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            settings = load_ai_settings()
             
             # Citește AI provider
-            cursor.execute("SELECT value FROM settings WHERE key = 'ai_provider'")
-            result = cursor.fetchone()
-            self.ai_provider = result[0] if result else 'openai'
+            self.ai_provider = settings.get('ai_provider') or 'openai'
             
             if self.ai_provider.lower() == 'openai':
                 # Pentru OpenAI - citește cheia API
                 api_key = os.getenv('OPENAI_API_KEY')
                 if api_key:
-                    self.client = OpenAI(api_key=api_key)
+                    self.client = AsyncOpenAI(api_key=api_key)
             elif self.ai_provider == 'ollama':
                 # Pentru Ollama - citește modelul
-                cursor.execute("SELECT value FROM settings WHERE key = 'ollama_model'")
-                result = cursor.fetchone()
-                self.ollama_model = result[0] if result else 'llama3:latest'
-                
-            conn.close()
+                self.ollama_model = settings.get('ollama_model') or 'llama3:latest'
         except Exception as e:
             print(f"Error loading AI config: {e}")
             # Fallback la OpenAI din .env
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
-                self.client = OpenAI(api_key=api_key)
+                self.client = AsyncOpenAI(api_key=api_key)
                 self.ai_provider = 'openai'
     
     def _parse_ollama_response(self, content):
@@ -117,20 +590,18 @@ class AIAnalysisPipeline:
             }
             
             # Încearcă să găsească patterns în text
-            import re
-            
             # Caută recommendation
-            rec_match = re.search(r'"recommendation":\s*"([^"]+)"', content, re.IGNORECASE)
+            rec_match = _RE_OLLAMA_REC.search(content)
             if rec_match:
                 result['recommendation'] = rec_match.group(1).upper()
             
             # Caută confidence score
-            conf_match = re.search(r'"confidence_score":\s*(\d+)', content)
+            conf_match = _RE_OLLAMA_CONF.search(content)
             if conf_match:
                 result['confidence_score'] = int(conf_match.group(1))
             
             # Caută instrument type
-            inst_match = re.search(r'"instrument_type":\s*"([^"]+)"', content, re.IGNORECASE)
+            inst_match = _RE_OLLAMA_INST.search(content)
             if inst_match:
                 result['instrument_type'] = inst_match.group(1)
             
@@ -145,66 +616,111 @@ class AIAnalysisPipeline:
             }
     
     def is_tradable(self, instrument_type: str, instrument_name: str, title: str) -> bool:
-        t = (instrument_type or '').lower()
-        name = (instrument_name or '').strip()
-        text = f"{name} {title}"
-        import re
-        if not name:
-            return False
-        if t == 'stocks':
-            return bool(re.search(r"\(([A-Z]{1,6})\)", text) or re.search(r"\b[A-Z]{1,6}\b", name))
-        if t == 'forex':
-            return bool(re.search(r"\b([A-Z]{3})/?([A-Z]{3})\b", text))
-        if t == 'crypto':
-            return bool(re.search(r"\b(BTC|ETH|SOL|ADA|XRP|DOGE|USDT|USDC|BNB)\b", text, re.I))
-        if t == 'commodities':
-            return bool(re.search(r"\b(gold|silver|oil|brent|wti|copper|corn|wheat|soy|natural gas)\b", text, re.I))
-        if t == 'indices':
-            return bool(re.search(r"(s&p|sp500|nasdaq|dow|dax|ftse|nikkei|cac|hang seng|tsx)", text, re.I))
-        return False
+        return _is_tradable_cached(instrument_type or '', instrument_name or '', title or '')
 
-    def extract_heuristic(self, title: str, content: str):
-        """Heuristic extraction when no AI key: returns (type, name) or (None, None)."""
-        import re
-        text = f"{title} {content}" if content else title
-        # Stocks: (AAPL) or EXCHANGE:TICKER
-        m = re.search(r"\(([A-Z]{1,6})\)", text)
-        if m:
-            return ('Stocks', m.group(1))
-        m = re.search(r"(nasdaq|nyse|amex|tsx|lse|sehk)\s*[:\-]\s*([A-Z]{1,6})", text, re.I)
-        if m:
-            return ('Stocks', m.group(2).upper())
-        # Forex: EUR/USD or USDJPY
-        m = re.search(r"\b([A-Z]{3})/?([A-Z]{3})\b", text)
-        if m:
-            pair = f"{m.group(1).upper()}/{m.group(2).upper()}"
-            return ('Forex', pair)
-        # Crypto: names or tickers
-        m = re.search(r"\b(BTC|ETH|SOL|ADA|XRP|DOGE|USDT|USDC|BNB)\b", text, re.I)
-        if m:
-            return ('Crypto', m.group(1).upper())
-        m = re.search(r"\b(bitcoin|ethereum|solana|cardano|ripple|dogecoin)\b", text, re.I)
-        if m:
-            name = m.group(1).lower()
-            mapping = {
-                'bitcoin': 'BTC', 'ethereum': 'ETH', 'solana': 'SOL',
-                'cardano': 'ADA', 'ripple': 'XRP', 'dogecoin': 'DOGE'
-            }
-            return ('Crypto', mapping.get(name, name.upper()))
-        # Commodities
-        if re.search(r"\b(gold|silver|oil|brent|wti|copper|corn|wheat|soy|natural gas)\b", text, re.I):
-            # Use matched commodity name as instrument_name
-            name = re.search(r"\b(gold|silver|oil|brent|wti|copper|corn|wheat|soy|natural gas)\b", text, re.I).group(1)
-            return ('Commodities', name.title())
-        # Indices
-        if re.search(r"(s&p|sp500|nasdaq\s*100?|dow\s*jones|dax|ftse|nikkei|cac|hang\s*seng|tsx)", text, re.I):
-            return ('Indices', 'Index')
-        return (None, None)
+    async def _request_analysis(self, model, messages):
+        """Analizează cu provider-ul configurat; întoarce (Analysis, strict), unde strict e False
+        dacă rezultatul vine din parserul tolerant (_parse_ollama_response)"""
+        strict = True
+        if self.ai_provider == 'openai':
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=300,
+                temperature=0.3
+            )
+            content = response.choices[0].message.content
+            try:
+                analysis_result = decode_analysis(content)
+            except msgspec.ValidationError:
+                # JSON valid dar cu tipuri neașteptate: extragem ce se poate, ca la Ollama
+                analysis_result = msgspec.convert(self._parse_ollama_response(content), Analysis, strict=False)
+                strict = False
+
+        elif self.ai_provider == 'ollama':
+            # Folosește Ollama pentru analiză
+            status, ollama_result = await post_json(f"{self.ollama_url}/api/chat", {
+                "model": model,
+                "messages": messages,
+                "stream": False,
+                "options": {
+                    "temperature": 0.3,
+                    "num_predict": 300
+                }
+            }, timeout=self.request_timeout)
+
+            if status == 200:
+                content = ollama_result.get('message', {}).get('content', '{}')
+
+                # Încearcă să extractezi JSON din răspuns
+                try:
+                    # Caută JSON în răspuns
+                    start_idx = content.find('{')
+                    end_idx = content.rfind('}') + 1
+                    if start_idx != -1 and end_idx > start_idx:
+                        json_str = content[start_idx:end_idx]
+                        analysis_result = decode_analysis(json_str)
+                    else:
+                        raise ValueError("No JSON found in response")
+                except ValueError:  # include msgspec.DecodeError / ValidationError
+                    # Fallback cu parsing manual dacă JSON nu este valid
+                    analysis_result = msgspec.convert(self._parse_ollama_response(content), Analysis, strict=False)
+                    strict = False
+            else:
+                raise Exception(f"Ollama API error: {status}")
+        else:
+            raise Exception(f"Unknown AI provider: {self.ai_provider}")
+        return analysis_result, strict
+
+    def heuristic_analysis(self, title: str, content: str):
+        """Analiză fără LLM: instrument + direcție, ambele doar din titlu, sau None."""
+        # Conținutul nu intră în euristică: un "(AP)" sau o sigla oarecare din text nu e instrumentul
+        itype, iname = extract_heuristic(title, '')
+        if not (itype and iname):
+            return None
+        positive = _RE_POSITIVE.search(title)
+        negative = _RE_NEGATIVE.search(title)
+        if bool(positive) == bool(negative):
+            return None  # fără semnal sau semnal ambiguu
+        return {
+            'instrument_type': itype,
+            'instrument_name': iname,
+            'recommendation': 'BUY' if positive else 'SELL',
+            'confidence_score': HEURISTIC_CONFIDENCE,
+            # Summary-ul articolului rămâne textul lui, ca pe calea fără AI din DatabasePipeline
+            'analysis': (content or title)[:500],
+        }
+
+    async def _analyze(self, model, item):
+        """Construiește prompt-ul pentru articol și cere analiza modelului"""
+        # Pregătește textul pentru analiză
+        title = item.get('title', '')
+        content = item.get('content', '')
+        # Titlul e trimis separat; nu-l mai plătim încă o dată în bugetul de conținut
+        if title and content.startswith(title):
+            content = content[len(title):].lstrip(' .:-\n')
+        text_to_analyze = f"Title: {title}\n\nContent: {truncate_tokens(content)}"
+
+        messages = [
+            {"role": "system", "content": ANALYSIS_PROMPT},
+            {"role": "user", "content": text_to_analyze}
+        ]
+        # Limitează cererile simultane către provider (Ollama local servește puține în paralel)
+        async with self._sem:
+            return await self._request_analysis(model, messages)
+
+    async def process_item(self, item, spider):
+        # Calea rapidă: instrument clar + titlu cu direcție puternică => fără apel LLM
+        if AI_HEURISTIC_SHORTCUT:
+            heuristic = self.heuristic_analysis(item.get('title', ''), item.get('content', ''))
+            if heuristic:
+                for key, value in heuristic.items():
+                    item[key] = value
+                return item
 
-    def process_item(self, item, spider):
         # Verifică dacă AI analysis este disponibil
         if not self.ai_provider or (self.ai_provider == 'openai' and not self.client) or (self.ai_provider == 'ollama' and not self.ollama_model):
-            spider.logger.warning(f"AI analysis not available (provider: {self.ai_provider}), using defaults")
+            spider.logger.warning("AI analysis not available (provider: %s), using defaults", self.ai_provider)
             # Setează valori default
             item['instrument_type'] = 'General'
             item['instrument_name'] = ''
@@ -214,88 +730,32 @@ class AIAnalysisPipeline:
             return item
         
         try:
-            # Pregătește textul pentru analiză
-            text_to_analyze = f"Title: {item.get('title', '')}\n\nContent: {item.get('content', '')[:2000]}"
-            
-            # Prompt pentru analiza financiară
-            system_prompt = """You are a financial analyst AI. Analyze the given financial news article and provide:
-
-1. instrument_type: One of [Stocks, Forex, Crypto, Commodities, Indices, Bonds]
-2. instrument_name: Specific instrument mentioned (e.g., "AAPL", "EUR/USD", "Bitcoin", "Gold", "S&P 500")
-3. recommendation: One of [BUY, SELL, HOLD]
-4. confidence_score: Integer from 1-100 indicating confidence in recommendation
-5. analysis: Brief 1-2 sentence summary of why this recommendation
-
-Response format: JSON only
-{
-  "instrument_type": "...",
-  "instrument_name": "...",
-  "recommendation": "...",
-  "confidence_score": 75,
-  "analysis": "..."
-}"""
-
-            # Analizează cu provider-ul configurat
-            if self.ai_provider == 'openai':
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": text_to_analyze}
-                    ],
-                    max_tokens=300,
-                    temperature=0.3
-                )
-                analysis_result = json.loads(response.choices[0].message.content)
-            
-            elif self.ai_provider == 'ollama':
-                # Folosește Ollama pentru analiză
-                ollama_response = requests.post(f"{self.ollama_url}/api/chat", json={
-                    "model": self.ollama_model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": text_to_analyze}
-                    ],
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "num_predict": 300
-                    }
-                })
-                
-                if ollama_response.status_code == 200:
-                    ollama_result = ollama_response.json()
-                    content = ollama_result.get('message', {}).get('content', '{}')
-                    
-                    # Încearcă să extractezi JSON din răspuns
-                    try:
-                        # Caută JSON în răspuns
-                        start_idx = content.find('{')
-                        end_idx = content.rfind('}') + 1
-                        if start_idx != -1 and end_idx > start_idx:
-                            json_str = content[start_idx:end_idx]
-                            analysis_result = json.loads(json_str)
-                        else:
-                            raise ValueError("No JSON found in response")
-                    except (json.JSONDecodeError, ValueError):
-                        # Fallback cu parsing manual dacă JSON nu este valid
-                        analysis_result = self._parse_ollama_response(content)
-                else:
-                    raise Exception(f"Ollama API error: {ollama_response.status_code}")
-            else:
-                raise Exception(f"Unknown AI provider: {self.ai_provider}")
+            model = "gpt-4o-mini" if self.ai_provider == 'openai' else self.ollama_model
+            # content_hash vine din DuplicatesPipeline; un hit sare peste prompt, tokenizare și LLM
+            h = item.get('content_hash') or content_hash(content_hash_base(item))
+            cache_key = (self.ai_provider, model, h)
+            analysis_result = self._memo.get(h)
+            if analysis_result is None:
+                analysis_result = self._ai_cache.get(cache_key)
+            if analysis_result is None:
+                analysis_result, strict = await self._analyze(model, item)
+                # Pe disc ajung doar răspunsurile JSON valide; cele reconstituite de parserul
+                # tolerant se cer din nou la rularea următoare
+                if strict:
+                    self._ai_cache.set(cache_key, analysis_result, expire=AI_CACHE_TTL)
+            self._memo.set(h, analysis_result)
             
             # Actualizează item-ul cu rezultatele analizei
-            item['instrument_type'] = analysis_result.get('instrument_type', 'General')
-            item['instrument_name'] = analysis_result.get('instrument_name', '')
-            item['recommendation'] = analysis_result.get('recommendation', 'HOLD')
-            item['confidence_score'] = int(analysis_result.get('confidence_score', 50))
-            item['analysis'] = analysis_result.get('analysis', '')
+            item['instrument_type'] = analysis_result.instrument_type
+            item['instrument_name'] = analysis_result.instrument_name
+            item['recommendation'] = analysis_result.recommendation
+            item['confidence_score'] = analysis_result.confidence_score
+            item['analysis'] = analysis_result.analysis
             
-            spider.logger.info(f"AI analysis completed for: {item.get('title', '')[:50]}...")
+            spider.logger.info("AI analysis completed for: %.50s...", item.get('title', ''))
             
         except Exception as e:
-            spider.logger.error(f"AI analysis failed: {str(e)}")
+            spider.logger.error("AI analysis failed: %s", e)
             # Valori default în caz de eroare
             item['instrument_type'] = 'General'
             item['instrument_name'] = ''
@@ -305,116 +765,184 @@ Response format: JSON only
         
         return item
 
+class ResolveYahooPipeline:
+    """Pipeline pentru verificarea simbolului Yahoo prin platformă (/api/resolve-yahoo)"""
+
+    # Request-uri resolve-yahoo simultane către platformă
+    CONCURRENCY = int(os.getenv('RESOLVE_CONCURRENCY', '16'))
+
+    def __init__(self):
+        self._resolve_cache = None
+        self._memo = LRUCache(4096)
+        self._sem = None
+        self._allow_unverified = True
+        self._platform = None
+
+    def open_spider(self, spider):
+        acquire_http_session()
+        # Citite o singură dată per rulare, nu la fiecare item
+        self._allow_unverified = os.getenv('ALLOW_UNVERIFIED_INSTRUMENTS', '1').lower() in ('1','true','yes')
+        self._platform = os.getenv('PLATFORM_API_URL', 'http://localhost:8080')
+        self._resolve_cache = open_cache('resolve_yahoo')
+        self._sem = asyncio.Semaphore(self.CONCURRENCY)
+
+    def close_spider(self, spider):
+        if self._resolve_cache is not None:
+            self._resolve_cache.close()
+        return release_http_session()
+
+    async def resolve(self, instrument_type, instrument_name, title):
+        """Răspunsul platformei pentru instrument (dict) sau None dacă nu a răspuns cu 200"""
+        key = (instrument_type, (instrument_name or '').lower())
+        data = self._memo.get(key)
+        if data is None:
+            data = self._resolve_cache.get(key)
+        if data is None:
+            async with self._sem:
+                status, data = await post_json(f"{self._platform}/api/resolve-yahoo", {
+                    'instrument_type': instrument_type,
+                    'instrument_name': instrument_name,
+                    'title': title
+                }, timeout=10)
+            if status != 200:
+                return None
+            data = data or {}
+            ttl = RESOLVE_CACHE_TTL if data.get('symbol') else RESOLVE_NEGATIVE_TTL
+            self._resolve_cache.set(key, data, expire=ttl)
+        self._memo.set(key, data)
+        return data
+
+    async def process_item(self, item, spider):
+        # Enforce non-empty instrument; as last resort, try heuristic one more time and then default to market index
+        if not item.get('instrument_name'):
+            itype, iname = extract_heuristic(item.get('title',''), item.get('content',''))
+            if itype and iname:
+                item['instrument_type'] = item.get('instrument_type') or itype
+                item['instrument_name'] = iname
+            else:
+                # Default to broad market index so item appears in feed
+                item['instrument_type'] = item.get('instrument_type') or 'Indices'
+                item['instrument_name'] = '^GSPC'
+
+        # Resolve and verify precise Yahoo symbol via platform API. If not verified, optionally keep based on env.
+        try:
+            data = await self.resolve(item.get('instrument_type'), item.get('instrument_name'), item.get('title',''))
+        except Exception as e:
+            spider.logger.warning("Resolve-yahoo failed: %s", e)
+            data = None
+        symbol = data.get('symbol') if data else None
+        if symbol:
+            item['instrument_name'] = symbol
+        elif not self._allow_unverified:
+            raise DropItem(f"Instrument neverificat: {item.get('instrument_name')}")
+        return item
+
+
+# Același text SQL la fiecare batch: o singură intrare în cache-ul de statement-uri sqlite3.
+# Doar conflictul pe content_hash e ignorat; rândurile care încalcă CHECK / NOT NULL sunt
+# raportate de insert_rows, nu înghițite ca duplicate (cum ar face INSERT OR IGNORE)
+_INSERT_SQL = (
+    "INSERT INTO news_articles "
+    "(title, summary, instrument_type, instrument_name, recommendation, "
+    "confidence_score, source_url, content_hash, published_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(content_hash) DO NOTHING"
+)
+
+
 class DatabasePipeline:
     """Pipeline pentru salvarea în baza de date SQLite"""
     
+    # Numărul de articole scrise într-o singură tranzacție (un singur commit/fsync)
+    BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '100'))
+
     def __init__(self):
         self.connection = None
         self.db_path = None
         self.saved_count = 0
-    
+        self._buf = []
+
     def open_spider(self, spider):
         # Găsește baza de date existentă
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.join(current_dir, '..', '..')
-        self.db_path = os.path.join(project_root, 'server', 'ainvestorhood.db')
+        self.db_path = DB_PATH
         
-        spider.logger.info(f"Connecting to database: {self.db_path}")
+        spider.logger.info("Connecting to database: %s", self.db_path)
         
         # Conectează la baza de date
         self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
         self.connection.execute('PRAGMA journal_mode=WAL')  # Pentru concurrency
+        # În WAL, synchronous=NORMAL sare fsync-ul la fiecare commit: rezistent la crash-ul
+        # procesului, dar ultima tranzacție se poate pierde la crash de OS / pană de curent.
+        # Setează SQLITE_SYNCHRONOUS=FULL dacă durabilitatea strictă contează.
+        synchronous = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+        if synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            synchronous = 'NORMAL'
+        self.connection.execute(f'PRAGMA synchronous={synchronous}')
+        self.connection.execute('PRAGMA busy_timeout=30000')  # Așteaptă writer-ul Node în loc de SQLITE_BUSY
+        self.connection.execute('PRAGMA temp_store=MEMORY')
+        self.connection.execute('PRAGMA mmap_size=268435456')  # 256 MB citiri prin memorie mapată
+        self.connection.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+
+        try:
+            ensure_unique_hash_index(self.connection)
+        except sqlite3.IntegrityError as e:
+            spider.logger.warning("Cannot create unique index on content_hash (existing duplicates): %s", e)
         
     def close_spider(self, spider):
         try:
-            spider.logger.info(f"saved to database: {self.saved_count}")
+            self._flush(spider)
+            spider.logger.info("saved to database: %d", self.saved_count)
         finally:
             if self.connection:
                 self.connection.close()
+
+    def _flush(self, spider):
+        """Scrie articolele din buffer cu executemany într-o singură tranzacție"""
+        rows, self._buf = self._buf, []
+        if not rows:
+            return
+        try:
+            # Duplicatele (din batch sau scrise între timp de serverul Node) sunt ignorate
+            # de indexul UNIQUE pe content_hash, fără SELECT separat
+            before = self.connection.total_changes
+            invalid = insert_rows(self.connection, _INSERT_SQL, rows)
+            saved = self.connection.total_changes - before
+            self.saved_count += saved
+            for row, e in invalid:
+                spider.logger.error("❌ Invalid article skipped (%s): %s", row[6], e)
+            spider.logger.info("✅ %d articles saved to database (%d already existed, %d invalid)",
+                               saved, len(rows) - saved - len(invalid), len(invalid))
+        except Exception as e:
+            spider.logger.error("❌ Database batch error (%d articles): %s", len(rows), e)
     
     def process_item(self, item, spider):
         try:
             # Guard invalid item
-            if item is None or not isinstance(item, dict):
-                return item
-            # Ensure content_hash exists
-            ch = item.get('content_hash')
-            if not ch:
-                base = f"{item.get('title','')}{item.get('content','')}"
-                item['content_hash'] = hashlib.md5(base.encode('utf-8')).hexdigest()
-
-            # Verifică dacă articolul există deja
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "SELECT id FROM news_articles WHERE content_hash = ?",
-                (item.get('content_hash',''),)
-            )
-            
-            if cursor.fetchone():
-                spider.logger.info(f"Article already exists in database: {item.get('title', '')[:50]}...")
+            if item is None or not ItemAdapter.is_item(item):
                 return item
+            # Ensure content_hash exists (de obicei setat deja de DuplicatesPipeline, care
+            # elimină și articolele deja salvate); restul duplicatelor le sare ON CONFLICT(content_hash)
+            if not item.get('content_hash'):
+                item['content_hash'] = content_hash(content_hash_base(item))
             
             # Inserează articolul nou
+            published_struct = item.get('published_struct')
             published_at = item.get('published_date')
-            if published_at:
+            if published_struct:
+                try:
+                    published_at = datetime(*published_struct).isoformat()
+                except ValueError:
+                    published_at = datetime.now().isoformat()
+            elif published_at and isinstance(published_at, str):
                 # Convertește la format ISO dacă este necesar
-                if isinstance(published_at, str):
-                    try:
-                        # Încearcă să parseze data
-                        from datetime import datetime
-                        import dateutil.parser
-                        parsed_date = dateutil.parser.parse(published_at)
-                        published_at = parsed_date.isoformat()
-                    except:
-                        published_at = datetime.now().isoformat()
-                else:
+                try:
+                    published_at = parse_date(published_at)
+                except (ValueError, OverflowError):
                     published_at = datetime.now().isoformat()
             else:
                 published_at = datetime.now().isoformat()
             
-            # Enforce non-empty instrument; as last resort, try heuristic one more time and then default to market index
-            if not item.get('instrument_name'):
-                itype, iname = self.extract_heuristic(item.get('title',''), item.get('content',''))
-                if itype and iname:
-                    item['instrument_type'] = item.get('instrument_type') or itype
-                    item['instrument_name'] = iname
-                else:
-                    # Default to broad market index so item appears in feed
-                    item['instrument_type'] = item.get('instrument_type') or 'Indices'
-                    item['instrument_name'] = '^GSPC'
-
-            # Resolve and verify precise Yahoo symbol via platform API. If not verified, optionally keep based on env.
-            try:
-                platform = os.getenv('PLATFORM_API_URL', 'http://localhost:8080')
-                r = requests.post(f"{platform}/api/resolve-yahoo", json={
-                    'instrument_type': item.get('instrument_type'),
-                    'instrument_name': item.get('instrument_name'),
-                    'title': item.get('title','')
-                }, timeout=10)
-                if r.status_code == 200:
-                    data = r.json() or {}
-                    symbol = data.get('symbol')
-                    if symbol:
-                        item['instrument_name'] = symbol
-                    else:
-                        # Fallback: allow unverified instruments if enabled
-                        allow_unverified = os.getenv('ALLOW_UNVERIFIED_INSTRUMENTS', '1') in ('1','true','yes')
-                        if not allow_unverified:
-                            return item  # drop silently
-                else:
-                    if os.getenv('ALLOW_UNVERIFIED_INSTRUMENTS', '1') not in ('1','true','yes'):
-                        return item
-            except Exception as e:
-                spider.logger.warning(f"Resolve-yahoo failed: {e}")
-                if os.getenv('ALLOW_UNVERIFIED_INSTRUMENTS', '1') not in ('1','true','yes'):
-                    return item
-
-            cursor.execute("""
-                INSERT INTO news_articles 
-                (title, summary, instrument_type, instrument_name, recommendation, 
-                 confidence_score, source_url, content_hash, published_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            self._buf.append((
                 item.get('title', ''),
                 item.get('analysis', item.get('content', '')[:500]),  # Folosește analiza ca summary
                 item.get('instrument_type', 'General'),
@@ -425,13 +953,11 @@ class DatabasePipeline:
                 item.get('content_hash', ''),
                 published_at
             ))
-            
-            self.connection.commit()
-            self.saved_count += 1
-            spider.logger.info(f"✅ Article saved to database: {item.get('title', '')[:50]}...")
+            if len(self._buf) >= self.BATCH_SIZE:
+                self._flush(spider)
             
         except Exception as e:
-            spider.logger.error(f"❌ Database error: {str(e)}")
-            self.connection.rollback()
+            # Nimic de anulat: scrierile se fac doar în _flush, într-un `with self.connection`
+            spider.logger.error("❌ Database error: %s", e)
         
         return item
\ No newline at end of file
@@ -22,22 +22,36 @@ DOWNLOADER_MIDDLEWARES = {
 ITEM_PIPELINES = {
     'news_scraper.pipelines.DuplicatesPipeline': 200,
     'news_scraper.pipelines.AIAnalysisPipeline': 300,
+    'news_scraper.pipelines.ResolveYahooPipeline': 350,
     'news_scraper.pipelines.DatabasePipeline': 400,
 }
 
+# Reactor asyncio: pipeline-urile cu `async def process_item` (aiohttp) rulează pe același event loop
+TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+# Thread pool-ul reactorului (rezolvări DNS, alte apeluri blocante)
+REACTOR_THREADPOOL_MAXSIZE = int(os.getenv('SCRAPY_REACTOR_THREADPOOL_MAXSIZE', '32'))
+
 # Configurații pentru respectful scraping (overridable via ENV for performance)
 DOWNLOAD_DELAY = float(os.getenv('SCRAPY_DOWNLOAD_DELAY', '0.25'))
 RANDOMIZE_DOWNLOAD_DELAY = True
 CONCURRENT_REQUESTS = int(os.getenv('SCRAPY_CONCURRENT_REQUESTS', '16'))
+# Peste ~4 conexiuni simultane pe același host, CDN-urile încep să răspundă cu 429
 CONCURRENT_REQUESTS_PER_DOMAIN = int(os.getenv('SCRAPY_CONCURRENT_REQUESTS_PER_DOMAIN', '4'))
 
-# Cache pentru dezvoltare
-HTTPCACHE_ENABLED = False
-HTTPCACHE_EXPIRATION_SECS = 3600
+# Cache HTTP cu politica RFC 2616: feed-urile nemodificate se revalidează condiționat
+# (If-None-Match / If-Modified-Since) și un 304 servește răspunsul din cache.
+# Opt-in: DbmCacheStorage nu e curățat niciodată (paginile de articol au dont_cache)
+HTTPCACHE_ENABLED = os.getenv('SCRAPY_HTTPCACHE_ENABLED', 'false').lower() in ('1','true','yes')
+HTTPCACHE_POLICY = 'scrapy.extensions.httpcache.RFC2616Policy'
+HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.DbmCacheStorage'
+HTTPCACHE_DIR = os.getenv('SCRAPY_HTTPCACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'httpcache'))
+HTTPCACHE_EXPIRATION_SECS = int(os.getenv('SCRAPY_HTTPCACHE_EXPIRATION_SECS', '600'))
 
 # Logs
 LOG_LEVEL = os.getenv('SCRAPY_LOG_LEVEL', 'INFO')
 LOG_FORMAT = '%(levelname)s: %(message)s'
+# Item-urile duplicate (DropItem) se loghează la DEBUG, nu ca WARNING cu tot item-ul
+LOG_FORMATTER = 'news_scraper.logformatter.QuietDropLogFormatter'
 
 # Timeout-uri
 DOWNLOAD_TIMEOUT = int(os.getenv('SCRAPY_DOWNLOAD_TIMEOUT', '45'))
@@ -54,7 +68,7 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 4.0
 DEFAULT_REQUEST_HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Encoding': 'gzip, deflate, br',  # br decodat de HttpCompressionMiddleware (brotli)
     'DNT': '1',
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1',
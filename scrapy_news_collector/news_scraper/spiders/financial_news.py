@@ -1,10 +1,35 @@
 import os
+import re
+import html
 import json
 import scrapy
 import feedparser
 from datetime import datetime
+from lxml import etree, html as lxml_html
 from news_scraper.items import NewsItem
 
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_WS = re.compile(r'\s+')
+
+
+def _class_xpath(cls, tail):
+    return etree.XPath(f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]{tail}")
+
+
+# Selectoarele de conținut, compilate o singură dată (în ordinea priorității);
+# echivalentele XPath ale vechilor selectoare CSS '.article-body::text', 'article p::text' etc.
+_CONTENT_XPATHS = [
+    _class_xpath('article-body', '/text()'),
+    _class_xpath('story-body', '/text()'),
+    _class_xpath('entry-content', '/text()'),
+    _class_xpath('post-content', '/text()'),
+    _class_xpath('content', '/text()'),
+    etree.XPath('//article//p/text()'),
+    _class_xpath('article', '//p/text()'),
+    _class_xpath('story', '//p/text()'),
+    etree.XPath('//p/text()'),
+]
+
 class FinancialNewsSpider(scrapy.Spider):
     name = 'financial_news'
     allowed_domains = []
@@ -37,10 +62,10 @@ class FinancialNewsSpider(scrapy.Spider):
             extra_list = json.loads(extra_raw) if extra_raw else []
             if isinstance(extra_list, list):
                 merged = list(dict.fromkeys(self.rss_feeds + extra_list))
-                self.logger.info(f"🧩 EXTRA_RSS_FEEDS merged: +{max(0, len(merged)-len(self.rss_feeds))} sources")
+                self.logger.info("🧩 EXTRA_RSS_FEEDS merged: +%d sources", max(0, len(merged)-len(self.rss_feeds)))
                 self.rss_feeds = merged
         except Exception as e:
-            self.logger.warning(f"Failed to load EXTRA_RSS_FEEDS: {e}")
+            self.logger.warning("Failed to load EXTRA_RSS_FEEDS: %s", e)
 
         for feed_url in self.rss_feeds:
             yield scrapy.Request(
@@ -56,24 +81,28 @@ class FinancialNewsSpider(scrapy.Spider):
         feed_url = response.meta['feed_url']
         
         try:
-            # Parsează RSS cu feedparser
-            feed = feedparser.parse(response.text)
+            # Parsează RSS cu feedparser direct din bytes: encoding-ul vine din declarația XML,
+            # fără decodarea completă în str făcută de response.text
+            feed = feedparser.parse(response.body)
+            entries = feed.entries[:10]  # Limitează la primele 10 articole
+            feed_title = feed.get('feed', {}).get('title', 'Unknown')
             
-            self.logger.info(f"📡 Processing RSS feed: {feed_url}")
-            self.logger.info(f"📰 Found {len(feed.entries)} articles in feed")
+            self.logger.info("📡 Processing RSS feed: %s", feed_url)
+            self.logger.info("📰 Found %d articles in feed", len(feed.entries))
             
-            for entry in feed.entries[:10]:  # Limitează la primele 10 articole
+            for entry in entries:
                 # Creează item-ul de bază din RSS
                 item = NewsItem()
                 item['title'] = entry.get('title', 'No title')
                 item['url'] = entry.get('link', '')
-                item['source'] = feed.get('feed', {}).get('title', 'Unknown')
+                item['source'] = feed_title
                 item['author'] = entry.get('author', '')
                 
                 # Procesează data publicării
                 published_date = entry.get('published_parsed') or entry.get('updated_parsed')
                 if published_date:
-                    item['published_date'] = datetime(*published_date[:6]).isoformat()
+                    # Tuplul brut (an, lună, zi, oră, minut, secundă); formatat ISO o singură dată, la salvare
+                    item['published_struct'] = tuple(published_date[:6])
                 else:
                     item['published_date'] = datetime.now().isoformat()
                 
@@ -92,7 +121,8 @@ class FinancialNewsSpider(scrapy.Spider):
                     yield scrapy.Request(
                         url=item['url'],
                         callback=self.parse_article,
-                        meta={'item': item},
+                        # Articolele se citesc o singură dată: doar feed-urile intră în cache-ul HTTP
+                        meta={'item': item, 'dont_cache': True},
                         dont_filter=True,
                         errback=self.handle_error
                     )
@@ -101,7 +131,7 @@ class FinancialNewsSpider(scrapy.Spider):
                     yield item
                     
         except Exception as e:
-            self.logger.error(f"❌ Error parsing RSS feed {feed_url}: {str(e)}")
+            self.logger.error("❌ Error parsing RSS feed %s: %s", feed_url, e)
     
     def parse_article(self, response):
         """Parsează articolul individual pentru mai mult conținut"""
@@ -109,22 +139,11 @@ class FinancialNewsSpider(scrapy.Spider):
         
         try:
             # Încearcă să extragi mai mult conținut din pagina articolului
-            # Selectoare generice pentru conținut
-            content_selectors = [
-                '.article-body::text',
-                '.story-body::text',
-                '.entry-content::text',
-                '.post-content::text',
-                '.content::text',
-                'article p::text',
-                '.article p::text',
-                '.story p::text',
-                'p::text'
-            ]
-            
+            # Selectoare generice pentru conținut, evaluate direct pe arborele lxml al paginii
+            root = response.selector.root
             additional_content = []
-            for selector in content_selectors:
-                content_parts = response.css(selector).getall()
+            for xpath in _CONTENT_XPATHS:
+                content_parts = xpath(root)
                 if content_parts and len(content_parts) > 2:  # Dacă găsește conținut substanțial
                     additional_content = content_parts
                     break
@@ -133,20 +152,20 @@ class FinancialNewsSpider(scrapy.Spider):
                 # Combinează conținutul extras cu cel din RSS
                 full_content = ' '.join(additional_content[:10])  # Primele 10 paragrafe
                 item['content'] = self.clean_html(full_content)
-                self.logger.info(f"✅ Enhanced content for: {item['title'][:50]}...")
+                self.logger.info("✅ Enhanced content for: %.50s...", item['title'])
             else:
-                self.logger.info(f"📄 Using RSS content for: {item['title'][:50]}...")
+                self.logger.info("📄 Using RSS content for: %.50s...", item['title'])
             
             yield item
             
         except Exception as e:
-            self.logger.error(f"❌ Error parsing article {response.url}: {str(e)}")
+            self.logger.error("❌ Error parsing article %s: %s", response.url, e)
             # Returnează item-ul cu conținutul din RSS
             yield item
     
     def handle_error(self, failure):
         """Gestionează erorile de scraping"""
-        self.logger.error(f"❌ Request failed: {failure.request.url}")
+        self.logger.error("❌ Request failed: %s", failure.request.url)
         # Încearcă să salveze item-ul cu datele disponibile din RSS
         if 'item' in failure.request.meta:
             yield failure.request.meta['item']
@@ -156,16 +175,17 @@ class FinancialNewsSpider(scrapy.Spider):
         if not text:
             return ''
         
-        # Înlătură tag-urile HTML simple
-        import re
-        text = re.sub(r'<[^>]+>', '', text)
+        # Parserul lxml (C) scoate tag-urile și decodează toate entitățile (inclusiv &#8217;);
+        # textul fără tag-uri are nevoie doar de html.unescape, iar cel fără '<' sau '&' de nimic
+        if '<' in text:
+            try:
+                text = lxml_html.fragment_fromstring(text, create_parent='div').text_content()
+            except (etree.ParserError, ValueError):
+                text = html.unescape(_RE_HTML_TAG.sub('', text))
+        elif '&' in text:
+            text = html.unescape(text)
         
-        # Înlătură caractere speciale și spații multiple
-        text = re.sub(r'\s+', ' ', text)
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&quot;', '"')
+        # Înlătură spațiile multiple (inclusiv &nbsp; decodat)
+        text = _RE_WS.sub(' ', text)
         
         return text.strip()[:2000]  # Limitează la 2000 caractere
\ No newline at end of file
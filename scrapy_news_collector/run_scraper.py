@@ -36,12 +36,17 @@ def run_scrapy():
     # Override settings at runtime from ENV for performance tuning
     # These are already read in settings.py from env, but ensure here too
     overrides = {
-        'CONCURRENT_REQUESTS': int(os.getenv('SCRAPY_CONCURRENT_REQUESTS', settings.getint('CONCURRENT_REQUESTS', 16))),
-        'CONCURRENT_REQUESTS_PER_DOMAIN': int(os.getenv('SCRAPY_CONCURRENT_REQUESTS_PER_DOMAIN', settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN', 4))),
+        # Profil de broad crawl: multe domenii, limitarea reală o face CONCURRENT_REQUESTS_PER_DOMAIN
+        'CONCURRENT_REQUESTS': int(os.getenv('SCRAPY_CONCURRENT_REQUESTS', 256)),
+        'CONCURRENT_REQUESTS_PER_DOMAIN': int(os.getenv('SCRAPY_CONCURRENT_REQUESTS_PER_DOMAIN', settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN', 8))),
         'DOWNLOAD_DELAY': float(os.getenv('SCRAPY_DOWNLOAD_DELAY', settings.getfloat('DOWNLOAD_DELAY', 0.25))),
         'DOWNLOAD_TIMEOUT': int(os.getenv('SCRAPY_DOWNLOAD_TIMEOUT', settings.getint('DOWNLOAD_TIMEOUT', 30))),
         'RETRY_TIMES': int(os.getenv('SCRAPY_RETRY_TIMES', settings.getint('RETRY_TIMES', 2))),
-        'DNS_TIMEOUT': int(os.getenv('SCRAPY_DNS_TIMEOUT', settings.getint('DNS_TIMEOUT', 30))),
+        'DNS_TIMEOUT': int(os.getenv('SCRAPY_DNS_TIMEOUT', 5)),
+        'DNSCACHE_SIZE': int(os.getenv('SCRAPY_DNSCACHE_SIZE', 500000)),
+        # Coada care alege domeniul cu cele mai puține request-uri în curs (fără head-of-line blocking)
+        'SCHEDULER_PRIORITY_QUEUE': 'scrapy.pqueues.DownloaderAwarePriorityQueue',
+        'HTTPCACHE_ALWAYS_STORE': os.getenv('SCRAPY_HTTPCACHE_ALWAYS_STORE', 'false').lower() in ('1','true','yes'),
         'AUTOTHROTTLE_ENABLED': os.getenv('SCRAPY_AUTOTHROTTLE_ENABLED', 'true').lower() in ('1','true','yes'),
         'LOG_LEVEL': os.getenv('SCRAPY_LOG_LEVEL', settings.get('LOG_LEVEL', 'INFO')),
     }
@@ -60,7 +60,8 @@ class DatabaseWrapper {
         // Index for faster queries
         this.db.run(`CREATE INDEX IF NOT EXISTS idx_created_at ON news_articles(created_at)`);
         this.db.run(`CREATE INDEX IF NOT EXISTS idx_published_at ON news_articles(published_at)`);
-        this.db.run(`CREATE INDEX IF NOT EXISTS idx_content_hash ON news_articles(content_hash)`);
+        // content_hash TEXT UNIQUE are deja indexul lui automat; indexul separat era redundant
+        this.db.run(`DROP INDEX IF EXISTS idx_content_hash`);
         this.db.run(`CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp ON system_metrics(timestamp)`, (err) => {
           if (err) {
             reject(err);
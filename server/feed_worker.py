@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Worker Scrapy de lungă durată folosit de unifiedScrapingService.js (metoda 'scrapy').
+Citește de pe stdin căi către fișiere JSON cu feed-uri (una pe linie); pentru fiecare
+scrie pe stdout câte o linie SCRAPY_ITEM:<json> per articol, apoi SCRAPY_DONE.
+Reactorul pornește o singură dată.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import scrapy
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+
+# Parserul de feed comun, din scrapy_news_collector/ (directorul părinte al server/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapy_news_collector.fast_parse import iter_articles
+
+logger = logging.getLogger(__name__)
+
+class FeedSpider(scrapy.Spider):
+    name = 'feed_spider'
+    
+    def __init__(self, feeds_file=None):
+        with open(feeds_file) as f:
+            self.start_urls = json.load(f)
+    
+    def start_requests(self):
+        # GET necondiționat: fiecare batch întoarce articolele feed-ului, ca metodele
+        # 'aiohttp' și 'python'; deduplicarea o face apelantul (content_hash)
+        for url in self.start_urls:
+            yield scrapy.Request(url, dont_filter=True)
+    
+    def parse(self, response):
+        # Parse RSS/Atom feeds direct pe arborele lxml al răspunsului
+        yield from iter_articles(response.selector.root)
+
+class JsonLinesPipeline:
+    """Scrie fiecare articol ca JSON Lines pe stdout, pe măsură ce e extras"""
+    
+    def process_item(self, item, spider):
+        print(f"SCRAPY_ITEM:{json.dumps(item)}", flush=True)
+        return item
+
+def main():
+    # Configure Scrapy settings
+    settings = get_project_settings()
+    settings.update({
+        'USER_AGENT': 'AIInvestorHood5-Bot/1.0',
+        'ROBOTSTXT_OBEY': False,
+        'DOWNLOAD_TIMEOUT': 15,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 4,
+        'LOG_LEVEL': 'ERROR',
+        'ITEM_PIPELINES': {f'{__name__}.JsonLinesPipeline': 100},
+        # Doar GET-uri de feed: fără cookies, auth, meta-refresh, referer sau adâncime de crawl.
+        # Rămân retry, redirect, compresie (gzip/br pe XML), proxy și tratarea codurilor HTTP.
+        'COOKIES_ENABLED': False,
+        'TELNETCONSOLE_ENABLED': False,
+        'MEMUSAGE_ENABLED': False,
+        'DOWNLOADER_MIDDLEWARES': {
+            'scrapy.downloadermiddlewares.httpauth.HttpAuthMiddleware': None,
+            'scrapy.downloadermiddlewares.redirect.MetaRefreshMiddleware': None,
+            'scrapy.downloadermiddlewares.ajaxcrawl.AjaxCrawlMiddleware': None,
+        },
+        'SPIDER_MIDDLEWARES': {
+            'scrapy.spidermiddlewares.referer.RefererMiddleware': None,
+            'scrapy.spidermiddlewares.urllength.UrlLengthMiddleware': None,
+            'scrapy.spidermiddlewares.depth.DepthMiddleware': None,
+        },
+        'EXTENSIONS': {
+            'scrapy.extensions.logstats.LogStats': None,
+        },
+    })
+    configure_logging(settings)
+    if settings.get('TWISTED_REACTOR'):
+        install_reactor(settings['TWISTED_REACTOR'])
+
+    # Importurile Twisted după instalarea reactorului
+    from twisted.internet import defer, reactor
+
+    runner = CrawlerRunner(settings)
+    # Un singur crawl odată: articolele fiecărui batch stau între start și SCRAPY_DONE
+    lock = defer.DeferredLock()
+
+    @defer.inlineCallbacks
+    def crawl(feeds_file):
+        try:
+            yield runner.crawl(FeedSpider, feeds_file=feeds_file)
+        except Exception as e:
+            logger.error("Feed batch %s failed: %s", feeds_file, e)
+        print("SCRAPY_DONE", flush=True)
+
+    def read_stdin():
+        # Citire blocantă într-un thread separat; crawl-urile se programează în reactor
+        for line in sys.stdin:
+            feeds_file = line.strip()
+            if feeds_file:
+                reactor.callFromThread(lock.run, crawl, feeds_file)
+        # stdin închis (procesul Node s-a oprit): ieșire după crawl-urile în curs
+        reactor.callFromThread(lock.run, reactor.stop)
+
+    threading.Thread(target=read_stdin, daemon=True).start()
+    reactor.run()
+
+if __name__ == '__main__':
+    main()
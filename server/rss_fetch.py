@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Colector RSS minimal (aiohttp + lxml), fără bootstrap-ul Scrapy; metoda 'aiohttp' din
+unifiedScrapingService.js. Primește pe stdin un JSON array cu URL-uri de feed și scrie
+pe stdout câte un articol per linie (JSON Lines), pe măsură ce feed-urile sosesc.
+"""
+import asyncio
+import json
+import os
+import sys
+import aiohttp
+
+# Parserul de feed comun, din scrapy_news_collector/ (directorul părinte al server/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapy_news_collector.fast_parse import parse
+
+HEADERS = {'User-Agent': 'AIInvestorHood5-Bot/1.0', 'Accept-Encoding': 'gzip, deflate, br'}
+TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+async def fetch(session, url):
+    try:
+        async with session.get(url, timeout=TIMEOUT) as response:
+            if response.status != 200:
+                print(f"HTTP {response.status} for {url}", file=sys.stderr)
+                return url, None
+            return url, await response.read()
+    except Exception as e:
+        print(f"Error fetching {url}: {e}", file=sys.stderr)
+        return url, None
+
+async def main(feeds):
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        for next_done in asyncio.as_completed([fetch(session, url) for url in feeds]):
+            url, body = await next_done
+            if not body:
+                continue
+            articles = parse(body)
+            for article in articles:
+                sys.stdout.write(json.dumps(article) + '\n')
+            sys.stdout.flush()
+            print(f"Got {len(articles)} articles from {url}", file=sys.stderr)
+
+if __name__ == '__main__':
+    asyncio.run(main(json.load(sys.stdin)))
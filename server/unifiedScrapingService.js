@@ -9,14 +9,16 @@ const path = require('path');
 class UnifiedScrapingService {
   constructor() {
     this.scrapingMethod = 'feedparser'; // Default method
-    this.availableMethods = ['feedparser', 'cheerio', 'puppeteer', 'scrapy', 'beautifulsoup'];
+    this.availableMethods = ['feedparser', 'cheerio', 'puppeteer', 'scrapy', 'beautifulsoup', 'aiohttp'];
     this.browser = null;
+    this.scrapyWorker = null;
     this.stats = {
       feedparser: { requests: 0, successes: 0, errors: 0, avgTime: 0 },
       cheerio: { requests: 0, successes: 0, errors: 0, avgTime: 0 },
       puppeteer: { requests: 0, successes: 0, errors: 0, avgTime: 0 },
       scrapy: { requests: 0, successes: 0, errors: 0, avgTime: 0 },
-      beautifulsoup: { requests: 0, successes: 0, errors: 0, avgTime: 0 }
+      beautifulsoup: { requests: 0, successes: 0, errors: 0, avgTime: 0 },
+      aiohttp: { requests: 0, successes: 0, errors: 0, avgTime: 0 }
     };
   }
 
@@ -48,7 +50,8 @@ class UnifiedScrapingService {
       cheerio: 'Cheerio (jQuery)',
       puppeteer: 'Puppeteer',
       scrapy: 'Scrapy',
-      beautifulsoup: 'Beautiful Soup'
+      beautifulsoup: 'Beautiful Soup',
+      aiohttp: 'aiohttp + lxml'
     };
     return names[method] || method;
   }
@@ -59,7 +62,8 @@ class UnifiedScrapingService {
       cheerio: 'Server-side jQuery-like HTML parsing',
       puppeteer: 'Headless Chrome browser automation',
       scrapy: 'Professional web scraping framework (Python)',
-      beautifulsoup: 'Python HTML/XML parsing library'
+      beautifulsoup: 'Python HTML/XML parsing library',
+      aiohttp: 'Lightweight async RSS fetcher without a crawler framework (Python)'
     };
     return descriptions[method] || 'Unknown method';
   }
@@ -87,6 +91,9 @@ class UnifiedScrapingService {
         case 'beautifulsoup':
           results = await this.scrapeWithBeautifulSoup(feeds);
           break;
+        case 'aiohttp':
+          results = await this.scrapeWithAiohttp(feeds);
+          break;
         default:
           throw new Error(`Unknown scraping method: ${this.scrapingMethod}`);
       }
@@ -288,118 +295,99 @@ class UnifiedScrapingService {
     return allArticles;
   }
 
-  async scrapeWithScrapy(feeds) {
-    return new Promise((resolve, reject) => {
-      console.log(`📡 Scrapy: Processing ${feeds.length} feeds`);
-      
-      // Create temporary file with feeds
-      const tempFile = path.join(__dirname, `feeds_${Date.now()}.json`);
-      fs.writeFileSync(tempFile, JSON.stringify(feeds));
+  getScrapyWorker() {
+    if (this.scrapyWorker) {
+      return this.scrapyWorker;
+    }
 
-      const pythonScript = `
-import scrapy
-import json
-import sys
-from scrapy.crawler import CrawlerProcess
-from scrapy.utils.project import get_project_settings
+    // Un singur proces Python de lungă durată: reactorul Scrapy pornește o dată,
+    // iar fiecare batch se trimite ca o cale de fișier pe stdin
+    const pythonVenv = path.join(__dirname, '../scrapy_news_collector/venv/bin/python');
+    const child = spawn(pythonVenv, [path.join(__dirname, 'feed_worker.py')], {
+      cwd: __dirname,
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    const worker = { process: child, pending: [], batches: 0 };
+
+    let buffer = '';
+    child.stdout.on('data', (data) => {
+      buffer += data.toString();
+      let newline;
+      while ((newline = buffer.indexOf('\n')) !== -1) {
+        const line = buffer.slice(0, newline);
+        buffer = buffer.slice(newline + 1);
+        // JSON Lines: articolele aparțin batch-ului curent (primul din coadă) până la SCRAPY_DONE
+        if (!worker.pending.length) {
+          continue;
+        }
+        if (line.startsWith('SCRAPY_ITEM:')) {
+          try {
+            worker.pending[0].articles.push(JSON.parse(line.slice('SCRAPY_ITEM:'.length)));
+          } catch (error) {
+            console.error('❌ Scrapy result parsing error:', error.message);
+          }
+        } else if (line === 'SCRAPY_DONE') {
+          const batch = worker.pending.shift();
+          batch.done(batch.articles);
+        }
+      }
+    });
 
-class FeedSpider(scrapy.Spider):
-    name = 'feed_spider'
-    
-    def __init__(self, feeds_file=None):
-        with open(feeds_file) as f:
-            self.start_urls = json.load(f)
-        self.articles = []
-    
-    def parse(self, response):
-        # Parse RSS/Atom feeds
-        items = response.xpath('//item')
-        if not items:
-            items = response.xpath('//entry')
-        
-        for item in items:
-            title = item.xpath('.//title/text()').get()
-            link = item.xpath('.//link/text()').get() or item.xpath('.//link/@href').get()
-            pub_date = item.xpath('.//pubDate/text()').get() or item.xpath('.//updated/text()').get()
-            description = item.xpath('.//description/text()').get() or item.xpath('.//summary/text()').get()
-            
-            if title and link:
-                self.articles.append({
-                    'title': title.strip(),
-                    'url': link.strip(),
-                    'pubDate': pub_date,
-                    'description': description.strip() if description else ''
-                })
-    
-    def closed(self, reason):
-        print(f"SCRAPY_RESULT:{json.dumps(self.articles)}")
-
-# Configure Scrapy settings
-settings = get_project_settings()
-settings.update({
-    'USER_AGENT': 'AIInvestorHood5-Bot/1.0',
-    'ROBOTSTXT_OBEY': False,
-    'DOWNLOAD_TIMEOUT': 15,
-    'LOG_LEVEL': 'ERROR'
-})
-
-process = CrawlerProcess(settings)
-process.crawl(FeedSpider, feeds_file='${tempFile}')
-process.start()
-`;
+    child.stderr.on('data', (data) => {
+      console.error('❌ Scrapy worker:', data.toString().trim());
+    });
 
-      const scriptFile = path.join(__dirname, `scrapy_script_${Date.now()}.py`);
-      fs.writeFileSync(scriptFile, pythonScript);
+    const reset = () => {
+      if (this.scrapyWorker === worker) {
+        this.scrapyWorker = null;
+      }
+      while (worker.pending.length) {
+        worker.pending.shift().done(null);
+      }
+    };
 
-      // Use the virtual environment Python for Scrapy
-      const pythonVenv = path.join(__dirname, '../scrapy_news_collector/venv/bin/python');
-      const scrapy = spawn(pythonVenv, [scriptFile], {
-        cwd: __dirname,
-        stdio: ['pipe', 'pipe', 'pipe']
-      });
+    child.on('close', (code) => {
+      if (code !== 0) {
+        console.error(`❌ Scrapy worker exited with code ${code}`);
+      }
+      reset();
+    });
 
-      let stdout = '';
-      let stderr = '';
+    child.on('error', (error) => {
+      console.error('❌ Scrapy spawn error:', error.message);
+      reset();
+    });
 
-      scrapy.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
+    child.stdin.on('error', () => {});
 
-      scrapy.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
+    this.scrapyWorker = worker;
+    return worker;
+  }
 
-      scrapy.on('close', (code) => {
-        // Clean up temp files
-        try {
-          fs.unlinkSync(tempFile);
-          fs.unlinkSync(scriptFile);
-        } catch (e) {}
+  async scrapeWithScrapy(feeds) {
+    return new Promise((resolve) => {
+      console.log(`📡 Scrapy: Processing ${feeds.length} feeds`);
+      
+      // Create temporary file with feeds (unic per batch, batch-urile pot fi concurente)
+      const worker = this.getScrapyWorker();
+      const tempFile = path.join(__dirname, `feeds_${Date.now()}_${worker.batches++}.json`);
+      fs.writeFileSync(tempFile, JSON.stringify(feeds));
 
-        if (code === 0) {
+      worker.pending.push({
+        articles: [],
+        done: (articles) => {
+          // Clean up temp file
           try {
-            const resultMatch = stdout.match(/SCRAPY_RESULT:(.+)/);
-            if (resultMatch) {
-              const articles = JSON.parse(resultMatch[1]);
-              console.log(`✅ Scrapy: Got ${articles.length} articles`);
-              resolve(articles);
-            } else {
-              resolve([]);
-            }
-          } catch (error) {
-            console.error('❌ Scrapy result parsing error:', error.message);
-            resolve([]);
+            fs.unlinkSync(tempFile);
+          } catch (e) {}
+
+          if (articles) {
+            console.log(`✅ Scrapy: Got ${articles.length} articles`);
           }
-        } else {
-          console.error(`❌ Scrapy process failed with code ${code}:`, stderr);
-          resolve([]);
+          resolve(articles || []);
         }
       });
-
-      scrapy.on('error', (error) => {
-        console.error('❌ Scrapy spawn error:', error.message);
-        resolve([]);
-      });
+      worker.process.stdin.write(`${tempFile}\n`);
     });
   }
 
@@ -504,6 +492,59 @@ print(json.dumps(all_articles))
     });
   }
 
+  async scrapeWithAiohttp(feeds) {
+    return new Promise((resolve) => {
+      console.log(`📡 aiohttp: Processing ${feeds.length} feeds`);
+
+      // Fără Scrapy: fetch concurent + parsare lxml, articolele vin ca JSON Lines
+      const pythonVenv = path.join(__dirname, '../scrapy_news_collector/venv/bin/python');
+      const fetcher = spawn(pythonVenv, [path.join(__dirname, 'rss_fetch.py')], {
+        cwd: __dirname,
+        stdio: ['pipe', 'pipe', 'pipe']
+      });
+
+      const articles = [];
+      let buffer = '';
+      let stderr = '';
+
+      fetcher.stdout.on('data', (data) => {
+        buffer += data.toString();
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (!line) {
+            continue;
+          }
+          try {
+            articles.push(JSON.parse(line));
+          } catch (error) {
+            console.error('❌ aiohttp result parsing error:', error.message);
+          }
+        }
+      });
+
+      fetcher.stderr.on('data', (data) => {
+        stderr += data.toString();
+      });
+
+      fetcher.on('close', (code) => {
+        if (code !== 0) {
+          console.error(`❌ aiohttp process failed with code ${code}:`, stderr);
+        }
+        console.log(`✅ aiohttp: Got ${articles.length} articles`);
+        resolve(articles);
+      });
+
+      fetcher.on('error', (error) => {
+        console.error('❌ aiohttp spawn error:', error.message);
+        resolve([]);
+      });
+
+      fetcher.stdin.on('error', () => {});
+      fetcher.stdin.end(JSON.stringify(feeds));
+    });
+  }
+
   updateStats(method, duration, success) {
     const stats = this.stats[method];
     if (success) {
@@ -524,6 +565,11 @@ print(json.dumps(all_articles))
       await this.browser.close();
       this.browser = null;
     }
+    if (this.scrapyWorker) {
+      // Închiderea stdin-ului oprește worker-ul după batch-ul în curs
+      this.scrapyWorker.process.stdin.end();
+      this.scrapyWorker = null;
+    }
   }
 
   getStats() {
@@ -4,12 +4,16 @@ Simple News Collector for AIInvestorHood5
 Colectează știri din RSS feeds și le salvează în baza de date
 """
 
+import os
 import sqlite3
-import requests
-import feedparser
+import asyncio
+import aiohttp
 import hashlib
+from collections import defaultdict
 from datetime import datetime
-import time
+from urllib.parse import urlparse
+from scrapy_news_collector import fast_parse
+from scrapy_news_collector.news_scraper.dbutil import ensure_unique_hash_index, insert_rows
 
 # RSS Feeds (doar cele care funcționează)
 RSS_FEEDS = [
@@ -22,90 +26,212 @@ RSS_FEEDS = [
 # Database path
 DB_PATH = '/app/data/ainvestorhood.db'
 
+HEADERS = {
+    'User-Agent': 'AIInvestorHood5-NewsBot/1.0 (Financial News Aggregator)',
+    # brotli comprimă XML-ul mai bine decât gzip; aiohttp îl decodează cu pachetul brotli din requirements
+    'Accept-Encoding': 'gzip, deflate, br'
+}
+
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=15)
+MAX_RETRY_AFTER = 30  # secunde
+RETRY_BACKOFF = 0.3  # secunde, pentru 502/503/504
+
+# În fereastra de migrare MD5 -> BLAKE2b, un articol e deja salvat și dacă hash-ul MD5 vechi există
+CONTENT_HASH_MD5_FALLBACK = os.getenv('CONTENT_HASH_MD5_FALLBACK', '1').lower() in ('1', 'true', 'yes')
+
+# Feed-urile se descarcă în paralel, dar cel mult un request simultan per domeniu (politețe)
+host_locks = defaultdict(lambda: asyncio.Semaphore(1))
+
+def retry_after(value):
+    """Secundele din header-ul Retry-After (forma numerică), plafonate la MAX_RETRY_AFTER"""
+    if value and value.strip().isdigit():
+        return min(int(value), MAX_RETRY_AFTER)
+    return None
+
 def create_content_hash(title, url):
     """Create a unique hash for content deduplication"""
     content = f"{title}{url}"
-    return hashlib.md5(content.encode()).hexdigest()
+    # BLAKE2b-128 (mai rapid decât MD5); hex, pentru că news_articles.content_hash e TEXT
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+def legacy_content_hash(title, url):
+    """Hash-ul MD5 folosit înainte de BLAKE2b, pentru rândurile deja salvate"""
+    return hashlib.md5(f"{title}{url}".encode()).hexdigest()
+
+def parse_feed(body, max_articles=5):
+    """Parsează feed-ul și întoarce articolele ca dict-uri simple"""
+    articles = []
+    
+    for entry in fast_parse.parse(body, max_articles):
+        articles.append({
+            'title': entry['title'],
+            'summary': entry['description'] or entry['title'],  # Trunchiat la 300 de caractere în INSERT
+            'url': entry['url'],
+            'published': datetime.now().isoformat(),
+            'content_hash': create_content_hash(entry['title'], entry['url']),
+            'legacy_hash': legacy_content_hash(entry['title'], entry['url']) if CONTENT_HASH_MD5_FALLBACK else None
+        })
+    
+    return articles
 
-def fetch_rss_articles(feed_url, max_articles=5):
-    """Fetch articles from RSS feed"""
+async def fetch_rss_articles(session, feed_url, max_articles=5, validators=None):
+    """Fetch articles from RSS feed (GET condiționat dacă avem ETag/Last-Modified în validators)"""
+    if validators is None:
+        validators = {}
+    headers = {}
+    etag, last_modified = validators.get(feed_url, (None, None))
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
     try:
-        print(f"📡 Fetching from {feed_url}...")
-        headers = {
-            'User-Agent': 'AIInvestorHood5-NewsBot/1.0 (Financial News Aggregator)'
-        }
-        
-        response = requests.get(feed_url, headers=headers, timeout=15)
-        
-        if response.status_code != 200:
-            print(f"   ❌ HTTP {response.status_code}")
-            return []
+        async with host_locks[urlparse(feed_url).netloc]:
+            print(f"📡 Fetching from {feed_url}...")
+            for attempt in range(2):
+                async with session.get(feed_url, headers=headers, timeout=FETCH_TIMEOUT) as response:
+                    status = response.status
+                    if status == 200:
+                        body = await response.read()
+                        validators[feed_url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                        break
+                    if status == 304:
+                        print(f"   💤 Not modified ({feed_url})")
+                        return []
+                    delay = None
+                    if status == 429:
+                        delay = retry_after(response.headers.get('Retry-After'))
+                    elif status in (502, 503, 504):
+                        delay = RETRY_BACKOFF
+                # Un singur retry (429 cu Retry-After sau erori tranzitorii); domeniul rămâne blocat cât așteptăm
+                if delay is None or attempt:
+                    print(f"   ❌ HTTP {status} ({feed_url})")
+                    return []
+                print(f"   ⏳ HTTP {status}, retrying {feed_url} in {delay}s")
+                await asyncio.sleep(delay)
             
-        feed = feedparser.parse(response.content)
-        articles = []
-        
-        for entry in feed.entries[:max_articles]:
-            try:
-                article = {
-                    'title': entry.title,
-                    'summary': entry.get('summary', entry.title)[:300],  # Limit summary length
-                    'url': entry.link,
-                    'published': datetime.now().isoformat(),
-                    'content_hash': create_content_hash(entry.title, entry.link)
-                }
-                articles.append(article)
-            except Exception as e:
-                print(f"   ⚠️  Error parsing entry: {e}")
-                continue
-                
-        print(f"   ✅ Found {len(articles)} articles")
+        # Parsarea (CPU) rulează în thread pool-ul implicit, ca event loop-ul să continue descărcările
+        articles = await asyncio.get_running_loop().run_in_executor(None, parse_feed, body, max_articles)
+        print(f"   ✅ Found {len(articles)} articles ({feed_url})")
         return articles
         
     except Exception as e:
         print(f"   ❌ Error fetching {feed_url}: {e}")
         return []
 
+# Doar conflictul pe content_hash e ignorat; alte încălcări de constrângeri (CHECK, NOT NULL)
+# sunt tratate rând cu rând de insert_rows (helper comun cu DatabasePipeline).
+# Summary-ul e limitat la 300 de caractere de SQLite (substr), fără o copie în Python.
+INSERT_SQL = """
+    INSERT INTO news_articles 
+    (title, summary, instrument_type, instrument_name, 
+     recommendation, confidence_score, source_url, content_hash, published_at)
+    VALUES (?, substr(?, 1, 300), ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(content_hash) DO NOTHING
+"""
+
+# O singură conexiune per proces, deschisă la prima utilizare: page cache-ul rămâne cald între apeluri
+_conn = None
+
+def get_connection():
+    """Conexiunea SQLite partajată (WAL)"""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("PRAGMA temp_store=MEMORY")
+        _conn.execute("PRAGMA mmap_size=268435456")
+    return _conn
+
+def close_connection():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+FEED_META_SQL = """
+    CREATE TABLE IF NOT EXISTS feed_meta (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        last_fetch TIMESTAMP
+    )
+"""
+
+def load_feed_meta():
+    """ETag/Last-Modified salvate la rularea anterioară, per URL de feed"""
+    conn = get_connection()
+    with conn:
+        conn.execute(FEED_META_SQL)
+    rows = conn.execute("SELECT url, etag, last_modified FROM feed_meta").fetchall()
+    return {url: (etag, last_modified) for url, etag, last_modified in rows}
+
+def save_feed_meta(validators):
+    """Persistă validatorii primiți pentru GET-urile condiționate de la rularea următoare"""
+    if not validators:
+        return
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO feed_meta (url, etag, last_modified, last_fetch) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+            [(url, etag, last_modified) for url, (etag, last_modified) in validators.items()]
+        )
+
+def drop_legacy_duplicates(conn, articles):
+    """Elimină articolele salvate înainte de trecerea la BLAKE2b (găsite după hash-ul MD5)"""
+    legacy = [a['legacy_hash'] for a in articles if a.get('legacy_hash')]
+    if not legacy:
+        return articles
+    placeholders = ','.join('?' * len(legacy))
+    existing = {h for (h,) in conn.execute(
+        f"SELECT content_hash FROM news_articles WHERE content_hash IN ({placeholders})", legacy
+    )}
+    return [a for a in articles if a.get('legacy_hash') not in existing]
+
 def save_articles_to_db(articles):
-    """Save articles to database"""
+    """Save articles to database; întoarce numărul salvat sau None dacă tranzacția a eșuat"""
     if not articles:
         return 0
         
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = get_connection()
     
+    # O singură tranzacție pentru tot lotul; duplicatele sunt sărite de ON CONFLICT
     saved_count = 0
-    
-    for article in articles:
-        try:
-            cursor.execute("""
-                INSERT INTO news_articles 
-                (title, summary, instrument_type, instrument_name, 
-                 recommendation, confidence_score, source_url, content_hash, published_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                article['summary'],
-                'stocks',  # Default to stocks
-                None,      # No specific instrument
-                'HOLD',    # Default recommendation
-                50,        # Default confidence
-                article['url'],
-                article['content_hash'],
-                article['published']
-            ))
-            saved_count += 1
-            print(f"   ✅ Saved: {article['title'][:60]}...")
-            
-        except sqlite3.IntegrityError:
-            print(f"   ⚠️  Duplicate: {article['title'][:60]}...")
-        except Exception as e:
-            print(f"   ❌ Error saving: {e}")
-    
-    conn.commit()
-    conn.close()
+    try:
+        # Articolele salvate sub hash-ul MD5 vechi nu se mai inserează încă o dată
+        new_articles = drop_legacy_duplicates(conn, articles)
+        rows = [(
+            a['title'],
+            a['summary'],
+            'stocks',  # Default to stocks
+            None,      # No specific instrument
+            'HOLD',    # Default recommendation
+            50,        # Default confidence
+            a['url'],
+            a['content_hash'],
+            a['published']
+        ) for a in new_articles]
+        before = conn.total_changes
+        invalid = insert_rows(conn, INSERT_SQL, rows)
+        saved_count = conn.total_changes - before
+        for row, e in invalid:
+            print(f"   ⚠️  Skipped invalid article ({row[6]}): {e}")
+        print(f"   ✅ Saved {saved_count} articles, {len(articles) - saved_count - len(invalid)} duplicates skipped")
+    except Exception as e:
+        print(f"   ❌ Error saving: {e}")
+        return None
     
     return saved_count
 
+async def fetch_all_feeds(feeds, max_articles=3, validators=None):
+    """Descarcă toate feed-urile concurent, pe o singură sesiune HTTP"""
+    # Semafoarele se leagă de event loop-ul în care sunt folosite; fiecare asyncio.run pornește curat
+    host_locks.clear()
+    # Pool de conexiuni keep-alive (TLS o singură dată per host) și cache DNS pe durata rulării
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        return await asyncio.gather(*(fetch_rss_articles(session, url, max_articles, validators) for url in feeds))
+
 def main():
     """Main collection function"""
     print("🏦 AIInvestorHood5 - Simple News Collector")
@@ -114,23 +240,30 @@ def main():
     
     total_saved = 0
     
-    for feed_url in RSS_FEEDS:
-        articles = fetch_rss_articles(feed_url, max_articles=3)
+    try:
+        # ON CONFLICT(content_hash) cere indexul UNIQUE (helper comun cu DatabasePipeline)
+        ensure_unique_hash_index(get_connection())
+    except sqlite3.IntegrityError as e:
+        print(f"   ⚠️  Cannot create unique index on content_hash (existing duplicates): {e}")
+    validators = load_feed_meta()
+    committed = {}
+    results = asyncio.run(fetch_all_feeds(RSS_FEEDS, max_articles=3, validators=validators))
+    for feed_url, articles in zip(RSS_FEEDS, results):
         saved = save_articles_to_db(articles)
+        if saved is None:
+            # Rollback: fără validatori noi, feed-ul se descarcă din nou complet la rularea următoare
+            continue
         total_saved += saved
-        
-        if feed_url != RSS_FEEDS[-1]:  # Don't sleep after last feed
-            time.sleep(2)  # Be respectful
+        if feed_url in validators:
+            committed[feed_url] = validators[feed_url]
+    save_feed_meta(committed)
     
     print(f"\n📊 Collection complete!")
     print(f"   Total articles saved: {total_saved}")
     
     # Show current database stats
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM news_articles")
-    total_count = cursor.fetchone()[0]
-    conn.close()
+    total_count = get_connection().execute("SELECT COUNT(*) FROM news_articles").fetchone()[0]
+    close_connection()
     
     print(f"   Total articles in database: {total_count}")
 
@@ -3,8 +3,10 @@
 
 echo "🏦 Starting automated news collection service..."
 
-# Copy collector to container
+# Copy collector (and its shared feed parser / SQLite helpers) to container
 docker cp simple_news_collector.py ainvestorhood5:/app/
+docker cp scrapy_news_collector/fast_parse.py ainvestorhood5:/app/scrapy_news_collector/
+docker cp scrapy_news_collector/news_scraper/dbutil.py ainvestorhood5:/app/scrapy_news_collector/news_scraper/
 
 # Run collector every 5 minutes
 while true; do